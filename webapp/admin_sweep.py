@@ -0,0 +1,170 @@
+"""Operator sweep: find every account missing mandatory profile fields.
+
+Pages through users via the Supabase admin API (service-role key required) or a
+local JSONL stand-in, applies the same rules as ``backend_V.get_completion_status`` (``completion_rules``)
+and streams one row per user to CSV/JSONL. Only a bounded window of pages is held
+in memory at any time, so the sweep runs in constant memory.
+
+Usage:
+    python webapp/admin_sweep.py --out incomplete.csv
+    python webapp/admin_sweep.py --local users.jsonl --out report.jsonl --all
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO, cast
+
+import streamlit as st
+from supabase import create_client, Client
+
+CURRENT_DIR = os.path.dirname(__file__)
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from completion_rules import user_field, evaluate_completion  # noqa: E402
+
+CSV_FIELDS = ["id", "email", "phone", "missing_fields", "needs_email_verification", "needs_phone_verification"]
+
+@st.cache_resource
+def init_admin_connection() -> Client:
+    url = st.secrets["SUPABASE_URL"]
+    key = st.secrets["SUPABASE_SERVICE_ROLE_KEY"]
+    return create_client(url, key)
+
+# --- Paging ---
+
+class RateLimiter:
+    """Allow at most ``rate`` calls per second across all threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def iter_paged_users(fetch_page: Callable[[int, int], list], per_page: int = 200,
+                     max_workers: int = 4, rate: float = 10.0) -> Iterator[Any]:
+    """Yield users from ``fetch_page(page, per_page)`` in page order.
+
+    Up to ``max_workers`` pages are in flight at once; paging stops at the first
+    empty page, so a server that caps ``per_page`` below the requested size is
+    still paged to the end. Requests are throttled to ``rate`` per second.
+    """
+    limiter = RateLimiter(rate)
+
+    def fetch(page: int) -> list:
+        limiter.wait()
+        return list(fetch_page(page, per_page) or [])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending: deque = deque()
+        next_page = 1
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_workers:
+                pending.append(pool.submit(fetch, next_page))
+                next_page += 1
+            if not pending:
+                break
+            users = pending.popleft().result()
+            if not users:
+                exhausted = True
+                for fut in pending:
+                    fut.cancel()
+                pending.clear()
+            yield from users
+
+def admin_page_fetcher(client: Optional[Client] = None) -> Callable[[int, int], list]:
+    """Page fetcher backed by ``auth.admin.list_users`` (pages are 1-based)."""
+    admin = cast(Any, (client or init_admin_connection()).auth).admin
+    return lambda page, per_page: admin.list_users(page=page, per_page=per_page)
+
+def iter_local_users(path: str) -> Iterator[dict]:
+    """Local stand-in for the admin API: one user JSON object per line."""
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+# --- Sweep ---
+
+def sweep(users: Iterable[Any], out: TextIO, fmt: str = "csv", include_complete: bool = False) -> dict[str, int]:
+    """Evaluate completion for each user and stream rows to ``out``.
+
+    Returns counts of users scanned and rows written.
+    """
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+    scanned = written = 0
+    for user in users:
+        scanned += 1
+        status = evaluate_completion(user)
+        complete = not (status["missing_fields"] or status["needs_email_verification"] or status["needs_phone_verification"])
+        if complete and not include_complete:
+            continue
+        row = {
+            "id": str(user_field(user, "id", "")),
+            "email": user_field(user, "email", ""),
+            "phone": user_field(user, "phone", ""),
+            **status,
+        }
+        if writer:
+            row["missing_fields"] = ";".join(row["missing_fields"])
+            writer.writerow(row)
+        else:
+            out.write(json.dumps(row) + "\n")
+        written += 1
+    return {"scanned": scanned, "written": written}
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return n
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report accounts missing mandatory fields or verification.")
+    parser.add_argument("--out", required=True, help="Output file (.csv or .jsonl), '-' for stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the --out extension")
+    parser.add_argument("--local", help="Read users from a JSONL file instead of the admin API")
+    parser.add_argument("--per-page", type=_positive_int, default=200)
+    parser.add_argument("--workers", type=_positive_int, default=4, help="Concurrent page requests")
+    parser.add_argument("--rate", type=float, default=10.0, help="Max page requests per second (0 = unlimited)")
+    parser.add_argument("--all", action="store_true", help="Include complete accounts too")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.out.endswith((".jsonl", ".json")) else "csv")
+    if args.local:
+        users = iter_local_users(args.local)
+    else:
+        users = iter_paged_users(admin_page_fetcher(), args.per_page, args.workers, args.rate)
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        counts = sweep(users, out, fmt, include_complete=args.all)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Scanned {counts['scanned']} users, wrote {counts['written']} rows.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
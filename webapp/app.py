@@ -1,7 +1,17 @@
+import io
+import os
+import sys
 import streamlit as st
 from supabase import create_client, Client
 from typing import Any, cast, Optional
 
+CURRENT_DIR = os.path.dirname(__file__)
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+import shared_cache  # noqa: E402
+import tool_io  # noqa: E402
+
 # --- Backend Functions (from backend_K.py) ---
 @st.cache_resource
 def init_connection() -> Client:
@@ -16,22 +26,27 @@ _auth = cast(Any, supabase.auth)
 def add_tool(user_id: str, name: str, desc: str, tool_type: str = "Hand Tool"):
     data = {"owner_id": user_id, "name": name, "description": desc}
     response = supabase.table("tools").insert(data).execute()
+    shared_cache.invalidate("tools")
     return response
 
+@shared_cache.cached("tools")
 def get_user_tools(user_id: str):
     response = supabase.table("tools").select("id, name, description").eq("owner_id", user_id).execute()
     return response.data if hasattr(response, 'data') else response
 
 def delete_tool(tool_id: int, user_id: str):
     response = supabase.table("tools").delete().eq("id", tool_id).eq("owner_id", user_id).execute()
+    shared_cache.invalidate("tools")
     return response
 
 # --- Browse Tools ---
+@shared_cache.cached("tools")
 def get_all_tools():
     response = supabase.table("tools").select("id, name, description, owner_id").execute()
     return response.data if hasattr(response, 'data') else response
 
 # --- Advanced Tool Search ---
+@shared_cache.cached("tools")
 def search_tools(name: str = None, tool_type: str = None):
     query = supabase.table("tools").select("id, name, description, owner_id")
     if name:
@@ -43,13 +58,16 @@ def search_tools(name: str = None, tool_type: str = None):
 def create_reservation(user_id: str, tool_id: int, start_date: str, end_date: str):
     data = {"borrower_id": user_id, "tool_id": tool_id, "start_date": start_date, "end_date": end_date}
     response = supabase.table("reservations").insert(data).execute()
+    shared_cache.invalidate("reservations")
     return response
 
+@shared_cache.cached("reservations")
 def get_user_reservations(user_id: str):
     response = supabase.table("reservations").select("id, tool_id, start_date, end_date").eq("borrower_id", user_id).execute()
     return response.data if hasattr(response, 'data') else response
 
 # Helper to get tool name by id
+@shared_cache.cached("tools")
 def get_tool_name(tool_id):
     response = supabase.table("tools").select("name").eq("id", tool_id).single().execute()
     if hasattr(response, 'data') and response.data:
@@ -58,6 +76,7 @@ def get_tool_name(tool_id):
 
 def delete_reservation(reservation_id: int, user_id: str):
     response = supabase.table("reservations").delete().eq("id", reservation_id).eq("borrower_id", user_id).execute()
+    shared_cache.invalidate("reservations")
     return response
 
 # --- Streamlit UI (from frontend.py, now using backend) ---
@@ -134,6 +153,7 @@ with tab3:
                 st.write(f"Tool: {tool_name}, Start: {r['start_date']}, End: {r['end_date']}")
                 if st.button("Delete Reservation", key=f"delres_{r['id']}"):
                     delete_reservation(r['id'], st.session_state.user_id)
+                    st.session_state.pop("prepared_exports", None)
                     st.success("Reservation deleted.")
         else:
             st.info("No reservations yet.")
@@ -152,6 +172,55 @@ with tab4:
             st.warning("Please log in to post a tool!")
         else:
             st.warning("Please enter a tool name!")
+    with st.expander("Bulk import / export"):
+        st.caption("CSV with `name,description` columns, or JSONL with one `{\"name\": ..., \"description\": ...}` per line.")
+        upload = st.file_uploader("Tools file", type=["csv", "jsonl"], key="bulk_upload")
+        if st.button("Import Tools"):
+            if not st.session_state.user_id:
+                st.warning("Please log in to import tools!")
+            elif upload is None:
+                st.warning("Please choose a file to import!")
+            else:
+                fp = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+                result = tool_io.import_tools(
+                    supabase,
+                    st.session_state.user_id,
+                    tool_io.iter_records(fp, tool_io.detect_format(upload.name)),
+                )
+                if result["inserted"]:
+                    # Any prepared export no longer reflects this user's tools.
+                    st.session_state.pop("prepared_exports", None)
+                if result["error"] is None:
+                    st.success(f"Imported {result['inserted']} tools.")
+                else:
+                    st.error(result["error"])
+                    if result["inserted"]:
+                        st.warning(f"Only {result['inserted']} tools were imported before the import stopped.")
+                if result["failed"]:
+                    st.warning(f"{len(result['failed'])} rows failed.")
+                    st.dataframe(result["failed"])
+        if st.session_state.user_id:
+            export_fmt = st.radio("Export format", ["csv", "jsonl"], horizontal=True, key="export_fmt")
+            if st.button("Prepare Export"):
+                # download_button needs the whole payload, so the export is buffered here.
+                exports = {}
+                for what, export in [("tools", tool_io.export_tools), ("reservations", tool_io.export_reservations)]:
+                    buf = io.StringIO()
+                    export(supabase, st.session_state.user_id, buf, export_fmt)
+                    exports[what] = (buf.getvalue(), export_fmt)
+                st.session_state.prepared_exports = {"user_id": st.session_state.user_id, "files": exports}
+            # Rendered outside the button branch so both survive the rerun a download triggers.
+            prepared = st.session_state.get("prepared_exports")
+            if prepared and prepared["user_id"] != st.session_state.user_id:
+                st.session_state.pop("prepared_exports", None)
+                prepared = None
+            for what, (data, fmt) in (prepared["files"] if prepared else {}).items():
+                st.download_button(
+                    f"Download {what}",
+                    data,
+                    file_name=f"{what}.{fmt}",
+                    key=f"download_{what}",
+                )
     st.markdown("---")
     st.subheader("Your Profile")
     if st.session_state.user_id:
@@ -172,6 +241,7 @@ with tab4:
                     )
                     if st.button("Delete", key=f"del_{tool['id']}"):
                         delete_tool(tool['id'], st.session_state.user_id)
+                        st.session_state.pop("prepared_exports", None)
                         st.success("Tool deleted.")
         else:
             st.info("You haven't posted any tools yet!")
@@ -209,6 +279,7 @@ def browse_tools():
                             str(start_date),
                             str(end_date)
                         )
+                        st.session_state.pop("prepared_exports", None)
                         st.success(f"Reserved '{tool['name']}' from {start_date} to {end_date}.")
             else:
                 st.sidebar.info("Log in to reserve tools.")
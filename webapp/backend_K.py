@@ -1,7 +1,15 @@
+import os
+import sys
 import streamlit as st
 from supabase import create_client, Client
 from typing import Any, cast, Optional
 
+CURRENT_DIR = os.path.dirname(__file__)
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+import shared_cache  # noqa: E402
+
 @st.cache_resource
 def init_connection() -> Client:
     url = st.secrets["SUPABASE_URL"]
@@ -18,22 +26,27 @@ _auth = cast(Any, supabase.auth)
 def add_tool(user_id: str, name: str, desc: str):
     data = {"user_id": user_id, "name": name, "desc": desc}
     response = supabase.table("tools").insert(data).execute()
+    shared_cache.invalidate("tools")
     return response
 
+@shared_cache.cached("tools")
 def get_user_tools(user_id: str):
     response = supabase.table("tools").select("id, name, desc").eq("user_id", user_id).execute()
     return response.data if hasattr(response, 'data') else response
 
 def delete_tool(tool_id: int, user_id: str):
     response = supabase.table("tools").delete().eq("id", tool_id).eq("user_id", user_id).execute()
+    shared_cache.invalidate("tools")
     return response
 
 # --- Browse Tools ---
+@shared_cache.cached("tools")
 def get_all_tools():
     response = supabase.table("tools").select("id, name, desc, user_id").execute()
     return response.data if hasattr(response, 'data') else response
 
 # --- Advanced Tool Search ---
+@shared_cache.cached("tools")
 def search_tools(name: str = None, tool_type: str = None):
     query = supabase.table("tools").select("id, name, desc, user_id, type")
     if name:
@@ -47,13 +60,16 @@ def search_tools(name: str = None, tool_type: str = None):
 def create_reservation(user_id: str, tool_id: int, start_date: str, end_date: str):
     data = {"user_id": user_id, "tool_id": tool_id, "start_date": start_date, "end_date": end_date}
     response = supabase.table("reservations").insert(data).execute()
+    shared_cache.invalidate("reservations")
     return response
 
+@shared_cache.cached("reservations")
 def get_user_reservations(user_id: str):
     response = supabase.table("reservations").select("id, tool_id, start_date, end_date").eq("user_id", user_id).execute()
     return response.data if hasattr(response, 'data') else response
 
 def delete_reservation(reservation_id: int, user_id: str):
     response = supabase.table("reservations").delete().eq("id", reservation_id).eq("user_id", user_id).execute()
+    shared_cache.invalidate("reservations")
     return response
 
@@ -1,7 +1,15 @@
+import os
+import sys
 import streamlit as st
 from supabase import create_client, Client
 from typing import Any, cast, Optional
 
+CURRENT_DIR = os.path.dirname(__file__)
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from completion_rules import user_field, evaluate_completion  # noqa: E402,F401
+
 @st.cache_resource
 def init_connection() -> Client:
     url = st.secrets["SUPABASE_URL"]
@@ -114,34 +122,9 @@ def get_completion_status():
     user = getattr(ures, "user", getattr(ures, "data", ures))
     if not user:
         return _err("No active user session")
-    # Access fields safely
-    email_confirmed_at = getattr(user, "email_confirmed_at", None) or (user.get("email_confirmed_at") if isinstance(user, dict) else None)
-    phone_confirmed_at = getattr(user, "phone_confirmed_at", None) or (user.get("phone_confirmed_at") if isinstance(user, dict) else None)
-    phone_val = getattr(user, "phone", None) or (user.get("phone") if isinstance(user, dict) else None)
-    meta = getattr(user, "user_metadata", None) or (user.get("user_metadata") if isinstance(user, dict) else {}) or {}
-    first_name = meta.get("first_name") if isinstance(meta, dict) else None
-    last_name = meta.get("last_name") if isinstance(meta, dict) else None
-    age = meta.get("age") if isinstance(meta, dict) else None
-
-    missing = []
-    if not first_name:
-        missing.append("first_name")
-    if not last_name:
-        missing.append("last_name")
-    if age is None:
-        missing.append("age")
-    if not phone_val:
-        missing.append("phone")
-
-    needs_email_verification = email_confirmed_at is None
-    needs_phone_verification = (phone_val is None) or (phone_confirmed_at is None)
-
-    return _ok({
-        "missing_fields": missing,
-        "needs_email_verification": needs_email_verification,
-        "needs_phone_verification": needs_phone_verification,
-        "user": user,
-    })
+    status = evaluate_completion(user)
+    status["user"] = user
+    return _ok(status)
 
 def verify_phone_sms(phone: str, token: str):
     """Verify phone via an SMS OTP code for current user."""
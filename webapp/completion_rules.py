@@ -0,0 +1,38 @@
+"""Account-completion rules shared by ``backend_V`` and ``admin_sweep``.
+
+Kept free of Streamlit/Supabase imports so offline tools can use it without secrets.
+"""
+from typing import Any
+
+def user_field(user: Any, name: str, default: Any = None):
+    """Read a field from a user object or a raw dict (admin API / JSON)."""
+    val = getattr(user, name, None)
+    if val is None and isinstance(user, dict):
+        val = user.get(name)
+    return default if val is None else val
+
+def evaluate_completion(user: Any) -> dict[str, Any]:
+    """Apply the mandatory-field and verification rules to a single user."""
+    email_confirmed_at = user_field(user, "email_confirmed_at")
+    phone_confirmed_at = user_field(user, "phone_confirmed_at")
+    phone_val = user_field(user, "phone") or None
+    meta = user_field(user, "user_metadata", {}) or {}
+    first_name = meta.get("first_name") if isinstance(meta, dict) else None
+    last_name = meta.get("last_name") if isinstance(meta, dict) else None
+    age = meta.get("age") if isinstance(meta, dict) else None
+
+    missing = []
+    if not first_name:
+        missing.append("first_name")
+    if not last_name:
+        missing.append("last_name")
+    if age is None:
+        missing.append("age")
+    if not phone_val:
+        missing.append("phone")
+
+    return {
+        "missing_fields": missing,
+        "needs_email_verification": email_confirmed_at is None,
+        "needs_phone_verification": (phone_val is None) or (phone_confirmed_at is None),
+    }
@@ -0,0 +1,196 @@
+"""Optional cache tier shared by every Streamlit worker process.
+
+``st.cache_data``/``st.cache_resource`` live inside one process, so behind a load
+balancer each worker keeps its own copy and goes stale on its own. This module
+stores cached results in a backend all workers can see:
+
+- ``sqlite:///path/to/cache.db`` (or just ``sqlite``): a local SQLite file, no
+  external services needed. The path after ``sqlite://`` is always absolute, so
+  every worker opens the same file regardless of its working directory.
+- ``redis://host:6379/0``: any Redis-compatible server (needs the ``redis`` package).
+
+Set ``SHARED_CACHE_URL`` in ``.streamlit/secrets.toml`` to enable it; when unset,
+decorated functions are called straight through. If the backend cannot be set up,
+the cache is disabled for the process and that is logged once. Runtime backend
+errors bypass the cache for that call only; they are logged at most once per
+``LOG_INTERVAL`` seconds with a count of the errors suppressed in between.
+
+Invalidation is generation based: each namespace (``"tools"``, ``"reservations"``)
+has a counter in the shared backend and every cache key embeds it. ``invalidate()``
+bumps the counter, so the next lookup in any worker misses and refills.
+"""
+import functools
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import urlparse
+
+import streamlit as st
+
+DEFAULT_TTL = 300
+PRUNE_INTERVAL = 60
+LOG_INTERVAL = 60
+
+logger = logging.getLogger(__name__)
+_log_lock = threading.Lock()
+_last_error_log = 0.0
+_suppressed_errors = 0
+
+def _log_runtime_error(exc: Exception):
+    """Log a backend error, rate-limited so a persistent outage stays visible."""
+    global _last_error_log, _suppressed_errors
+    now = time.monotonic()
+    with _log_lock:
+        if _last_error_log and now - _last_error_log < LOG_INTERVAL:
+            _suppressed_errors += 1
+            return
+        suppressed, _suppressed_errors, _last_error_log = _suppressed_errors, 0, now
+    logger.warning("Shared cache error, bypassing cache: %s (%d similar errors since last report)", exc, suppressed)
+
+class SQLiteCache:
+    """Cache backend stored in a SQLite file shared between processes."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(tempfile.gettempdir(), "toolshare_cache.db")
+        self._local = threading.local()
+        self._last_prune = 0.0
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS generations (namespace TEXT PRIMARY KEY, gen INTEGER NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str, ttl: int):
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)", (key, value, now + ttl))
+            # Distinct search strings keep adding keys, so drop expired rows periodically.
+            if now - self._last_prune > PRUNE_INTERVAL:
+                self._last_prune = now
+                conn.execute("DELETE FROM cache WHERE expires < ?", (now,))
+
+    def generation(self, namespace: str) -> int:
+        row = self._conn().execute("SELECT gen FROM generations WHERE namespace = ?", (namespace,)).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, namespace: str):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO generations (namespace, gen) VALUES (?, 1) "
+                "ON CONFLICT(namespace) DO UPDATE SET gen = gen + 1",
+                (namespace,),
+            )
+            # Entries from older generations can never be read again.
+            conn.execute("DELETE FROM cache WHERE key LIKE ? OR expires < ?", (f"{namespace}:%", time.time()))
+
+class RedisCache:
+    """Cache backend for any Redis-compatible client (``get``/``set``/``incr``)."""
+
+    def __init__(self, client: Any, prefix: str = "toolshare:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCache":
+        import redis  # optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url, decode_responses=True))
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: str, ttl: int):
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def generation(self, namespace: str) -> int:
+        return int(self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    def bump(self, namespace: str):
+        # Stale keys are left to expire via their TTL.
+        self.client.incr(f"{self.prefix}gen:{namespace}")
+
+def backend_from_url(url: Optional[str]):
+    if not url:
+        return None
+    if url.startswith(("redis://", "rediss://")):
+        return RedisCache.from_url(url)
+    if url == "sqlite" or url.startswith("sqlite://"):
+        # urlparse keeps the leading "/", so sqlite:///tmp/x.db -> /tmp/x.db.
+        path = urlparse(url).path if url.startswith("sqlite://") else ""
+        return SQLiteCache(path or None)
+    raise ValueError(f"Unsupported SHARED_CACHE_URL: {url}")
+
+@st.cache_resource
+def get_backend():
+    """Build the configured backend once per process; ``None`` if unset or broken."""
+    try:
+        return backend_from_url(st.secrets.get("SHARED_CACHE_URL"))
+    except Exception as e:
+        logger.warning("Shared cache disabled, could not set up backend: %s", e)
+        return None
+
+def _backend():
+    try:
+        return get_backend()
+    except Exception as e:
+        _log_runtime_error(e)
+        return None
+
+def cached(namespace: str, ttl: int = DEFAULT_TTL) -> Callable:
+    """Cache a function's JSON-serialisable result in the shared backend.
+
+    Backend errors never break the page: the wrapped function is called directly.
+    Its own exceptions propagate unchanged and it is never called twice.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            backend = _backend()
+            key = None
+            if backend is not None:
+                try:
+                    params = json.dumps([args, kwargs], sort_keys=True, default=str)
+                    key = f"{namespace}:{backend.generation(namespace)}:{fn.__module__}.{fn.__name__}:{params}"
+                    hit = backend.get(key)
+                    if hit is not None:
+                        return json.loads(hit)
+                except Exception as e:
+                    _log_runtime_error(e)
+                    key = None
+            result = fn(*args, **kwargs)
+            if key is not None:
+                try:
+                    backend.set(key, json.dumps(result, default=str), ttl)
+                except Exception as e:
+                    _log_runtime_error(e)
+            return result
+        return wrapper
+    return decorator
+
+def invalidate(*namespaces: str):
+    """Drop cached entries for ``namespaces`` in every worker."""
+    backend = _backend()
+    if backend is None:
+        return
+    try:
+        for namespace in namespaces:
+            backend.bump(namespace)
+    except Exception as e:
+        _log_runtime_error(e)
@@ -0,0 +1,231 @@
+"""Bulk import/export of tool listings.
+
+Rows are parsed and validated as a stream, inserted in multi-row batches (one
+request per batch instead of one per tool). A batch rejected for row-level reasons
+(constraint or data errors) is split and retried so only the bad rows are
+reported; auth, permission and transport errors abort the import instead. Exports
+page through the tables and write rows as they arrive. Used by the My Page tab in
+``app.py`` (which buffers exports in memory for ``st.download_button``) and as a
+CLI, where exports stream straight to the output file:
+
+    python webapp/tool_io.py import --user-id <uuid> tools.csv
+    python webapp/tool_io.py --service-role import --user-id <uuid> tools.csv
+    python webapp/tool_io.py export tools --user-id <uuid> --out tools.jsonl
+    python webapp/tool_io.py export reservations --user-id <uuid> --out reservations.csv
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+import streamlit as st
+from supabase import create_client, Client
+
+CURRENT_DIR = os.path.dirname(__file__)
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+import shared_cache  # noqa: E402
+
+BATCH_SIZE = 500
+PAGE_SIZE = 1000
+MAX_NAME_LENGTH = 200
+TOOL_FIELDS = ["id", "name", "description"]
+RESERVATION_FIELDS = ["id", "tool_id", "start_date", "end_date"]
+# Postgres SQLSTATE classes that point at the rows themselves:
+# 22 = data exception, 23 = integrity constraint violation.
+ROW_ERROR_CLASSES = ("22", "23")
+
+@st.cache_resource
+def init_connection(service_role: bool = False) -> Client:
+    """Anon client (RLS applies) unless ``service_role`` is set, which bypasses RLS."""
+    url = st.secrets["SUPABASE_URL"]
+    key = st.secrets["SUPABASE_SERVICE_ROLE_KEY"] if service_role else st.secrets["SUPABASE_KEY"]
+    return create_client(url, key)
+
+def detect_format(filename: str) -> str:
+    return "jsonl" if filename.lower().endswith((".jsonl", ".json", ".ndjson")) else "csv"
+
+# --- Import ---
+
+def iter_records(fp: TextIO, fmt: str) -> Iterator[tuple[int, Any]]:
+    """Yield ``(line_number, record)`` pairs.
+
+    Unparseable JSON lines yield the error in place of the record. A decoding or
+    CSV error yields the error and ends the stream, since nothing after it can be
+    read reliably.
+    """
+    line_no = 0
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(fp)
+            for record in reader:
+                line_no = reader.line_num
+                yield line_no, record
+            return
+        for line_no, line in enumerate(fp, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, e
+    except (UnicodeDecodeError, csv.Error) as e:
+        yield line_no + 1, e
+
+def validate_record(record: Any) -> tuple[Optional[dict], Optional[str]]:
+    """Return ``(row, None)`` for a valid tool record, else ``(None, error)``."""
+    if isinstance(record, json.JSONDecodeError):
+        return None, f"Invalid JSON: {record}"
+    if isinstance(record, UnicodeDecodeError):
+        return None, "File is not valid UTF-8"
+    if isinstance(record, Exception):
+        return None, f"Could not read row: {record}"
+    if not isinstance(record, dict):
+        return None, "Row must be an object"
+    name = str(record.get("name") or "").strip()
+    desc = record.get("description", record.get("desc")) or ""
+    if not name:
+        return None, "Name is required"
+    if len(name) > MAX_NAME_LENGTH:
+        return None, f"Name is longer than {MAX_NAME_LENGTH} characters"
+    return {"name": name, "description": str(desc).strip()}, None
+
+class ImportAborted(Exception):
+    """Raised when an insert fails for a reason unrelated to the rows (auth, RLS, network)."""
+
+def _is_row_error(exc: Exception) -> bool:
+    return str(getattr(exc, "code", None) or "")[:2] in ROW_ERROR_CLASSES
+
+def _flush(client: Client, batch: list[tuple[int, dict]], result: dict[str, Any]):
+    try:
+        client.table("tools").insert([row for _, row in batch]).execute()
+    except Exception as e:
+        if not _is_row_error(e):
+            raise ImportAborted(str(e)) from e
+        if len(batch) == 1:
+            result["failed"].append({"line": batch[0][0], "error": str(e)})
+            return
+        # Bisect to isolate the bad rows so the rest of the batch still lands.
+        mid = len(batch) // 2
+        _flush(client, batch[:mid], result)
+        _flush(client, batch[mid:], result)
+        return
+    result["inserted"] += len(batch)
+
+def import_tools(client: Client, user_id: str, records: Iterable[tuple[int, Any]], batch_size: int = BATCH_SIZE) -> dict[str, Any]:
+    """Validate and insert tool records for ``user_id`` in batches.
+
+    Returns ``{"inserted": int, "failed": [{"line": int, "error": str}, ...],
+    "error": Optional[str]}``; ``error`` is set when the import was aborted early.
+    """
+    result: dict[str, Any] = {"inserted": 0, "failed": [], "error": None}
+    batch: list[tuple[int, dict]] = []
+    try:
+        for line_no, record in records:
+            row, error = validate_record(record)
+            if error:
+                result["failed"].append({"line": line_no, "error": error})
+                continue
+            row["owner_id"] = user_id
+            batch.append((line_no, row))
+            if len(batch) >= batch_size:
+                _flush(client, batch, result)
+                batch = []
+        if batch:
+            _flush(client, batch, result)
+    except ImportAborted as e:
+        result["error"] = f"Import stopped: {e}"
+    if result["inserted"]:
+        shared_cache.invalidate("tools")
+    return result
+
+# --- Export ---
+
+def _iter_table(client: Client, table: str, columns: list[str], owner_column: str, user_id: str, page_size: int = PAGE_SIZE) -> Iterator[dict]:
+    start = 0
+    while True:
+        response = (
+            client.table(table).select(", ".join(columns)).eq(owner_column, user_id)
+            .order("id").range(start, start + page_size - 1).execute()
+        )
+        rows = response.data if hasattr(response, 'data') else response
+        yield from rows or []
+        if not rows or len(rows) < page_size:
+            return
+        start += page_size
+
+def write_records(records: Iterable[dict], out: TextIO, fmt: str, fields: list[str]) -> int:
+    """Stream ``records`` to ``out`` as CSV or JSONL; returns the row count."""
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+    count = 0
+    for record in records:
+        if writer:
+            writer.writerow(record)
+        else:
+            out.write(json.dumps({f: record.get(f) for f in fields}, default=str) + "\n")
+        count += 1
+    return count
+
+def export_tools(client: Client, user_id: str, out: TextIO, fmt: str = "csv") -> int:
+    return write_records(_iter_table(client, "tools", TOOL_FIELDS, "owner_id", user_id), out, fmt, TOOL_FIELDS)
+
+def export_reservations(client: Client, user_id: str, out: TextIO, fmt: str = "csv") -> int:
+    return write_records(_iter_table(client, "reservations", RESERVATION_FIELDS, "borrower_id", user_id), out, fmt, RESERVATION_FIELDS)
+
+# --- CLI ---
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import/export of ToolShare listings.")
+    parser.add_argument("--service-role", action="store_true",
+                        help="Use SUPABASE_SERVICE_ROLE_KEY (bypasses RLS, allows any --user-id); default is the anon key")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="Import tools from a CSV/JSONL file ('-' for stdin)")
+    imp.add_argument("file")
+    imp.add_argument("--user-id", required=True)
+    imp.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    imp.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    exp = sub.add_parser("export", help="Export a user's tools or reservations")
+    exp.add_argument("what", choices=["tools", "reservations"])
+    exp.add_argument("--user-id", required=True)
+    exp.add_argument("--out", default="-", help="Output file, '-' for stdout")
+    exp.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the --out extension")
+    args = parser.parse_args(argv)
+
+    client = init_connection(args.service_role)
+    if args.command == "import":
+        fmt = args.format or detect_format(args.file)
+        fp = sys.stdin if args.file == "-" else open(args.file, newline="", encoding="utf-8-sig")
+        try:
+            result = import_tools(client, args.user_id, iter_records(fp, fmt), args.batch_size)
+        finally:
+            if fp is not sys.stdin:
+                fp.close()
+        for failure in result["failed"]:
+            print(f"line {failure['line']}: {failure['error']}", file=sys.stderr)
+        if result["error"]:
+            print(result["error"], file=sys.stderr)
+        print(f"Inserted {result['inserted']} tools, {len(result['failed'])} failed.", file=sys.stderr)
+        return 1 if result["failed"] or result["error"] else 0
+
+    fmt = args.format or detect_format(args.out)
+    export = export_tools if args.what == "tools" else export_reservations
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        count = export(client, args.user_id, out, fmt)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Exported {count} {args.what}.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())